@@ -5,11 +5,25 @@ A read-only status board showing booking pace, lead metrics, and capacity.
 
 import streamlit as st
 import gspread
+from gspread.utils import absolute_range_name, fill_gaps
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from functools import lru_cache
+from operator import itemgetter
+import heapq
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
 import time
 import plotly.graph_objects as go
 
@@ -28,6 +42,15 @@ def get_filemaker_url():
     except (KeyError, FileNotFoundError):
         return ""  # Will fail gracefully if not configured
 
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+
+# Last fetched grid of each worksheet, so restarts skip re-reading unchanged sheets
+SHEETS_CACHE_DIR = Path(__file__).parent / ".sheets_cache"
+
+# Re-read a worksheet at least this often (seconds), even if Drive says it is
+# unchanged - modifiedTime can lag edits and ignores formula recalculation
+SHEETS_CACHE_MAX_AGE = 3600
+
 SCOPES = [
     "https://spreadsheets.google.com/feeds",
     "https://www.googleapis.com/auth/spreadsheets",
@@ -40,75 +63,227 @@ SCOPES = [
 # =============================================================================
 
 @st.cache_resource
-def get_google_client():
-    """Initialize Google Sheets client with service account credentials."""
+def get_google_credentials():
+    """Load service account credentials for the Google APIs."""
     try:
         # Try Streamlit Cloud secrets first
         creds_dict = dict(st.secrets["gcp_service_account"])
-        creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+        return Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
     except (KeyError, FileNotFoundError):
         # Fall back to local credentials file
-        creds = Credentials.from_service_account_file(
+        return Credentials.from_service_account_file(
             "your-credentials.json", scopes=SCOPES
         )
-    return gspread.authorize(creds)
+
+
+@st.cache_resource
+def get_google_session():
+    """Shared authorized session for Sheets and Drive, with pooled keep-alive connections."""
+    session = AuthorizedSession(get_google_credentials())
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_google_client():
+    """Initialize Google Sheets client with service account credentials."""
+    return gspread.Client(auth=get_google_credentials(), session=get_google_session())
+
+
+@st.cache_resource
+def get_http_session():
+    """Shared HTTP session so FileMaker requests reuse pooled connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_filemaker_responses():
+    """Last events and validators (ETag / Last-Modified) per FileMaker window URL."""
+    return {}
 
 
 # =============================================================================
 # DATA FETCHING
 # =============================================================================
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def get_year_comparison_data():
-    """Fetch YoY booking comparison from Booking Snapshots sheet."""
+logger = logging.getLogger(__name__)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_sheet_modified_time(sheet_id):
+    """Fetch a spreadsheet's last-modified time from Drive (a cheap metadata call)."""
+    try:
+        response = get_google_session().get(
+            f"{DRIVE_FILES_URL}/{sheet_id}",
+            params={"fields": "modifiedTime", "supportsAllDrives": "true"},
+            timeout=10,
+        )
+        response.raise_for_status()
+        return response.json()["modifiedTime"]
+    except Exception as e:
+        # Drive metadata unavailable - fall back to re-reading the sheet hourly
+        logger.warning(
+            "Drive modifiedTime unavailable for sheet %s (is the Drive API enabled?); "
+            "re-reading it hourly instead: %s", sheet_id, e,
+        )
+        return f"hour-{int(time.time() // 3600)}"
+
+
+def get_sheet_values(sheet_id, worksheet_title, value_render_option="FORMATTED_VALUE"):
+    """Fetch every cell of a worksheet, re-reading it only after the sheet changes."""
+    modified_time = get_sheet_modified_time(sheet_id)
+    return fetch_sheet_values(sheet_id, worksheet_title, modified_time, value_render_option)
+
+
+def sheet_cache_path(sheet_id, worksheet_title, value_render_option):
+    """On-disk cache file for one worksheet (one file per tab, overwritten on change)."""
+    digest = hashlib.sha1(f"{sheet_id}/{worksheet_title}/{value_render_option}".encode()).hexdigest()
+    return SHEETS_CACHE_DIR / f"{digest}.json"
+
+
+def load_cached_values(sheet_id, worksheet_title, value_render_option, modified_time):
+    """Return the grid saved on disk for this sheet version, or None."""
+    try:
+        with open(sheet_cache_path(sheet_id, worksheet_title, value_render_option), encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("modified_time") != modified_time:
+        return None
+    if time.time() - cached.get("saved_at", 0) > SHEETS_CACHE_MAX_AGE:
+        return None
+    return cached.get("values")
+
+
+def save_cached_values(sheet_id, worksheet_title, value_render_option, modified_time, values):
+    """Save a fetched grid to disk; the cache is best-effort, so failures are ignored."""
+    path = sheet_cache_path(sheet_id, worksheet_title, value_render_option)
+    try:
+        path.parent.mkdir(exist_ok=True)
+        # Write then rename, so a concurrent reader never sees a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"modified_time": modified_time, "saved_at": time.time(), "values": values}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def clear_cached_values():
+    """Delete every grid saved on disk, so the next load re-reads the sheets."""
+    for path in SHEETS_CACHE_DIR.glob("*.json"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+@st.cache_data(ttl=SHEETS_CACHE_MAX_AGE, max_entries=16, show_spinner=False)
+def fetch_sheet_values(sheet_id, worksheet_title, modified_time, value_render_option="FORMATTED_VALUE"):
+    """Fetch every cell of a worksheet as a rectangular grid.
+    
+    Cells are display strings by default; with UNFORMATTED_VALUE numbers come
+    back as numbers (dates still as their display strings).
+    modified_time is only part of the cache key: a new value means the sheet
+    changed and the cached grid is stale.
+    """
+    # Only a real Drive modifiedTime identifies a sheet version; the hourly
+    # fallback key would serve stale data across restarts
+    persist = not modified_time.startswith("hour-")
+    if persist:
+        cached = load_cached_values(sheet_id, worksheet_title, value_render_option, modified_time)
+        if cached is not None:
+            return cached
+    
     client = get_google_client()
-    sheet = client.open_by_key(BOOKING_SNAPSHOTS_SHEET_ID)
-    worksheet = sheet.worksheet("Year Comparison")
+    sheet = client.open_by_key(sheet_id)
+    
+    # Read the tab by name in one values request; sheet.worksheet() would cost
+    # an extra metadata round trip before the actual read
+    response = sheet.values_batch_get(
+        [absolute_range_name(worksheet_title)],
+        params={"valueRenderOption": value_render_option, "dateTimeRenderOption": "FORMATTED_STRING"},
+    )
+    values = response["valueRanges"][0].get("values", [])
     
-    # Use get_all_values() to handle any header weirdness
-    all_values = worksheet.get_all_values()
+    # The values API trims trailing empty cells, so pad rows like get_all_values()
+    values = fill_gaps(values) if values else []
+    
+    if persist:
+        save_cached_values(sheet_id, worksheet_title, value_render_option, modified_time, values)
+    return values
+
+
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)  # Cache for 5 minutes (reloads skip unchanged sheets)
+def get_year_comparison_data():
+    """Fetch YoY booking comparison from Booking Snapshots sheet."""
+    # Read raw values to handle any header weirdness. Counts come back as
+    # numbers rather than display strings; Day labels keep their "Feb 3" text
+    all_values = get_sheet_values(BOOKING_SNAPSHOTS_SHEET_ID, "Year Comparison", "UNFORMATTED_VALUE")
     if not all_values:
         return pd.DataFrame()
     
-    # First row is headers
-    headers = all_values[0]
+    # One 2D array for the whole grid (rows are padded to the same width);
+    # the data rows are a view of it rather than a copied list
+    grid = np.array(all_values, dtype=object)
+    
+    # First row is headers (as strings, even where a year header is a number)
+    headers = [str(h) for h in grid[0]]
     
     # Create DataFrame with remaining rows
-    df = pd.DataFrame(all_values[1:], columns=headers)
+    df = pd.DataFrame(grid[1:], columns=headers)
+    
+    # Convert year columns ("2025", "2026", ...) to ints once here so every
+    # cached read gets typed counts; empty cells become 0
+    year_cols = [col for col in df.columns if re.fullmatch(r"\d{4}", str(col))]
+    df[year_cols] = df[year_cols].apply(pd.to_numeric, errors="coerce").fillna(0).astype("int32")
+    
+    # Parse "Feb 3"-style Day labels against the current year
+    if "Day" in df.columns:
+        df["_day_parsed"] = parse_day_labels(df["Day"], datetime.now().year)
     return df
 
 
-@st.cache_data(ttl=3600)
-def get_inquiry_tracker_data():
-    """Fetch all inquiry data from the Inquiry Tracker sheet."""
-    client = get_google_client()
-    sheet = client.open_by_key(INQUIRY_TRACKER_SHEET_ID)
-    worksheet = sheet.worksheet("Master View")
-    
-    # Use get_all_values() to handle duplicate/empty headers
-    all_values = worksheet.get_all_values()
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def get_inquiry_tracker_data(year=2026):
+    """Fetch inquiry data for one year's events from the Inquiry Tracker sheet."""
+    # Read raw values to handle duplicate/empty headers
+    all_values = get_sheet_values(INQUIRY_TRACKER_SHEET_ID, "Master View")
     if not all_values:
         return pd.DataFrame()
     
-    # First row is headers
-    headers = all_values[0]
-    
-    # Make headers unique by appending index to duplicates/empties
-    seen = {}
-    unique_headers = []
-    for i, h in enumerate(headers):
-        if h == '' or h in seen:
-            # Create unique name for empty or duplicate
-            base = h if h else f'Column_{i}'
-            count = seen.get(base, 0)
-            unique_headers.append(f"{base}_{count}" if count > 0 else base)
-            seen[base] = count + 1
-        else:
-            unique_headers.append(h)
-            seen[h] = 1
+    # One 2D array for the whole grid (rows are padded to the same width);
+    # the data rows are a view of it rather than a copied list
+    grid = np.array(all_values, dtype=object)
     
-    # Create DataFrame with remaining rows
-    df = pd.DataFrame(all_values[1:], columns=unique_headers)
+    # First row is headers
+    headers = grid[0].tolist()
+    
+    # Make headers unique: empties become Column_<index>, repeats get _1, _2, ...
+    names = pd.Series(headers, dtype=object)
+    names = names.where(names != "", [f"Column_{i}" for i in range(len(names))])
+    repeat = names.groupby(names, sort=False).cumcount()
+    unique_headers = names.where(repeat == 0, names + "_" + repeat.astype(str)).tolist()
+    
+    # Create DataFrame with remaining rows, keeping only the columns the
+    # dashboard reads so dedup and metrics work on a narrower frame
+    df = pd.DataFrame(grid[1:], columns=unique_headers)
+    needed = [
+        "Timestamp", "Inquiry Date", "Event Date", "Decision Date", "Venue (if known)",
+        "Resolution", "Level of interaction", "Initial Contact",
+    ]
+    # Arrow-backed strings: compact buffers, and the .str ops below run in C
+    df = df[[col for col in needed if col in df.columns]].astype("string[pyarrow]")
+    
+    # Keep only the requested year's events (by Event Date, not Timestamp) before
+    # dedup; duplicates share an Event Date, so this doesn't change which survive
+    if "Event Date" in df.columns:
+        df = df[parse_sheet_dates(df["Event Date"]).dt.year == year]
     
     # Track pre-dedup count
     pre_dedup_count = len(df)
@@ -124,69 +299,64 @@ def get_inquiry_tracker_data():
         # Sort by timestamp descending (newest first)
         df = df.sort_values("_parsed_timestamp", ascending=False)
         
-        # Smart deduplication
-        def smart_dedup(group):
-            if len(group) == 1:
-                return group
-            
-            resolution_col = "Resolution" if "Resolution" in group.columns else None
-            if not resolution_col:
-                return group.head(1)
-            
-            # Find Booked and Canceled rows
-            booked_mask = group[resolution_col].str.lower().str.strip() == "booked"
-            canceled_mask = group[resolution_col].str.lower().str.strip() == "canceled"
-            
-            booked_rows = group[booked_mask].sort_values("_parsed_timestamp", ascending=False)
-            canceled_rows = group[canceled_mask]
-            
-            if len(booked_rows) == 0:
-                # No bookings - keep newest row only
-                return group.head(1)
+        # Smart deduplication, as whole-frame masks instead of a per-group apply
+        keys = ["Event Date", "Venue (if known)"]
+        if "Resolution" in df.columns:
+            resolution = df["Resolution"].str.lower().str.strip()
+            is_booked = resolution == "booked"
+            is_canceled = resolution == "canceled"
+            group_ids = df.groupby(keys, sort=False).ngroup()
             
             # Count valid cancellations (timestamp after ANY booking)
-            earliest_booking_ts = booked_rows["_parsed_timestamp"].min()
-            valid_cancellations = 0
-            for _, cancel_row in canceled_rows.iterrows():
-                cancel_ts = cancel_row["_parsed_timestamp"]
-                if pd.notna(cancel_ts) and pd.notna(earliest_booking_ts) and cancel_ts > earliest_booking_ts:
-                    valid_cancellations += 1
+            booked_count = is_booked.groupby(group_ids).transform("sum")
+            earliest_booking_ts = df["_parsed_timestamp"].where(is_booked).groupby(group_ids).transform("min")
+            valid_cancellations = is_canceled & (df["_parsed_timestamp"] > earliest_booking_ts)
             
             # Net bookings = booked - cancellations (minimum 0)
-            net_bookings = max(0, len(booked_rows) - valid_cancellations)
-            
-            if net_bookings == 0:
-                # All bookings canceled - return newest canceled row
-                return canceled_rows.head(1) if len(canceled_rows) > 0 else group.head(1)
+            net_bookings = (booked_count - valid_cancellations.groupby(group_ids).transform("sum")).clip(lower=0)
             
-            # Return the newest N booked rows
-            return booked_rows.head(net_bookings)
-        
-        df = df.groupby(["Event Date", "Venue (if known)"], group_keys=False).apply(smart_dedup)
+            # Keep the newest N booked rows
+            keep = is_booked & (is_booked.groupby(group_ids).cumsum() <= net_bookings)
+            # All bookings canceled - keep the newest canceled row
+            keep |= (booked_count > 0) & (net_bookings == 0) & is_canceled & (is_canceled.groupby(group_ids).cumsum() == 1)
+            # No bookings - keep newest row only
+            keep |= (booked_count == 0) & ~group_ids.duplicated()
+            df = df[keep]
+        else:
+            df = df.drop_duplicates(keys)
         
         # Clean up temp column
         df = df.drop(columns=["_parsed_timestamp"])
     
-    # Store dedup stats in a special row (will be filtered out later)
-    # Actually, let's add columns instead
-    df["_dedup_pre"] = pre_dedup_count
-    df["_dedup_post"] = len(df)
+    # Low-cardinality labels as categoricals: compact codes, faster masks/groupbys
+    for col in ["Resolution", "Level of interaction", "Initial Contact"]:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    
+    # Store dedup stats as frame metadata (kept through st.cache_data's pickling)
+    df.attrs["dedup_pre"] = pre_dedup_count
+    df.attrs["dedup_post"] = len(df)
     
     return df
 
 
-@st.cache_data(ttl=3600)
+# "BOOKED x 2" in the (upper-cased) TBA column = 2 bookings. The count is
+# the word after the cell's first "X", and only when that X is "BOOKED X "
+BOOKED_X_RE = re.compile(r"^[^X]*BOOKED X \s*(\d+)(?=[\s,]|$)")
+
+
+@st.cache_data(ttl=300, show_spinner=False)
 def get_dj_booking_counts(year=2026):
     """Count BOOKED events per DJ from the Availability Matrix."""
-    client = get_google_client()
-    sheet = client.open_by_key(AVAILABILITY_MATRIX_SHEET_ID)
-    
     try:
-        worksheet = sheet.worksheet(str(year))
-    except Exception:
-        return {}
+        all_values = get_sheet_values(AVAILABILITY_MATRIX_SHEET_ID, str(year))
+    except gspread.exceptions.APIError as e:
+        # Only a missing tab for this year means "no bookings"; auth, quota and
+        # network errors must surface rather than be cached as empty
+        if e.response.status_code == 400 and "Unable to parse range" in str(e):
+            return {}
+        raise
     
-    all_values = worksheet.get_all_values()
     if not all_values:
         return {}
     
@@ -226,106 +396,129 @@ def get_dj_booking_counts(year=2026):
         }
         tba_col = 8
     
+    # Data rows as a view of one 2D array (rows are padded to the header width)
+    grid = np.array(all_values, dtype=object)[1:]
+    
+    # Strip and upper-case the DJ and TBA columns together in one pass;
+    # columns past the sheet's width count as empty
+    col_idxs = [idx for idx in [*dj_columns.values(), tba_col] if idx < grid.shape[1]]
+    cells = np.char.upper(np.char.strip(grid[:, col_idxs].astype(str)))
+    normalized = dict(zip(col_idxs, cells.T))
+    no_cells = np.array([], dtype=str)
+    
     # Count BOOKED for each DJ
     counts = {}
     for dj, col_idx in dj_columns.items():
-        count = 0
-        for row in all_values[1:]:  # Skip header
-            if col_idx < len(row):
-                cell_value = str(row[col_idx]).strip().upper()
-                if cell_value == "BOOKED":
-                    count += 1
-        counts[dj] = count
+        counts[dj] = int((normalized.get(col_idx, no_cells) == "BOOKED").sum())
     
     # Count TBA (unassigned) bookings
     # TBA can be: "BOOKED", "BOOKED x 2", "AAG", "BOOKED, AAG", etc.
-    tba_count = 0
-    for row in all_values[1:]:
-        if tba_col < len(row):
-            cell_value = str(row[tba_col]).strip().upper()
-            if not cell_value:
-                continue
-            
-            added = 0
-            # Count each BOOKED mention
-            if "BOOKED X " in cell_value:
-                # "BOOKED x 2" -> 2
-                try:
-                    num = int(cell_value.split("X")[1].strip().split()[0])
-                    added = num
-                except (IndexError, ValueError):
-                    added = 1
-            elif "BOOKED" in cell_value:
-                added = 1
-            
-            # Add AAG if present (separate from BOOKED)
-            if "AAG" in cell_value:
-                if "BOOKED" not in cell_value:
-                    added = 1  # Just AAG alone
-                else:
-                    added += 1  # AAG in addition to BOOKED
-            
-            if added > 0:
-                tba_count += added
+    tba_cells = pd.Series(normalized.get(tba_col, no_cells), dtype=object)
+    has_booked = tba_cells.str.contains("BOOKED", regex=False)
+    has_aag = tba_cells.str.contains("AAG", regex=False)
+    
+    # Count each BOOKED mention: "BOOKED x 2" -> 2, plain "BOOKED" -> 1
+    multiplier = pd.to_numeric(tba_cells.str.extract(BOOKED_X_RE, expand=False), errors="coerce")
+    added = multiplier.fillna(has_booked.astype(int)).astype(int)
     
-    counts["TBA"] = tba_count
+    # Add AAG if present (separate from BOOKED)
+    added += has_aag
+    
+    counts["TBA"] = int(added[added > 0].sum())
     
     return counts
 
 
-@st.cache_data(ttl=3600)
+@st.cache_data(ttl=300, max_entries=8, show_spinner=False)  # Gig data changes often; keep it fresher than sheets
 def get_upcoming_events(days_ahead=14):
-    """Fetch upcoming events from FileMaker gig database."""
+    """Fetch upcoming events from FileMaker gig database.
+    
+    Returns (events, errors); errors are messages for windows that could not
+    be fetched, shown by the caller so this stays free of Streamlit elements.
+    """
     filemaker_url = get_filemaker_url()
     if not filemaker_url:
-        return []  # Skip if FileMaker URL not configured
+        return [], []  # Skip if FileMaker URL not configured
     
     today = datetime.now()
     events = []
+    errors = []
     
     # Query FileMaker for multiple days using the multi-day endpoint
     # Endpoint returns ±3 days (7 day window), step by 6 to ensure overlap
+    date_strs = []
     for offset in range(0, days_ahead + 4, 6):  # +4 ensures we capture the end
         query_date = today + timedelta(days=offset)
         # Format date without leading zeros (works on all platforms)
-        date_str = f"{query_date.month}/{query_date.day}/{query_date.year}"
+        date_strs.append(f"{query_date.month}/{query_date.day}/{query_date.year}")
+    
+    session = get_http_session()
+    responses = get_filemaker_responses()
+    urls = [f"{filemaker_url}/availabilityMDjson.php?date={date_str}" for date_str in date_strs]
+    
+    def fetch_window(url):
+        # Revalidate the last response for this window: if it hasn't changed,
+        # FileMaker answers 304 with no body and the stored events are reused
+        previous = responses.get(url)
+        headers = {}
+        if previous:
+            if previous["etag"]:
+                headers["If-None-Match"] = previous["etag"]
+            if previous["last_modified"]:
+                headers["If-Modified-Since"] = previous["last_modified"]
         
+        response = session.get(url, headers=headers, timeout=10)
+        if response.status_code == 304 and previous:
+            return previous["events"]
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, list):
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    responses[url] = {"etag": etag, "last_modified": last_modified, "events": data}
+                return data
+        return []
+    
+    # Fire all window requests at once
+    with ThreadPoolExecutor(max_workers=len(date_strs)) as executor:
+        futures = [executor.submit(fetch_window, url) for url in urls]
+    
+    for date_str, future in zip(date_strs, futures):
         try:
-            url = f"{filemaker_url}/availabilityMDjson.php?date={date_str}"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, list):
-                    events.extend(data)
+            events.extend(future.result())
         except Exception as e:
-            st.warning(f"Could not fetch events for {date_str}: {e}")
+            errors.append(f"Could not fetch events for {date_str}: {e}")
     
-    # Deduplicate and filter to date range
-    seen = set()
-    unique_events = []
-    end_date = today + timedelta(days=days_ahead)
+    # Forget windows that have scrolled out of range (their URLs carry a date)
+    for url in set(responses) - set(urls):
+        responses.pop(url, None)
     
-    for event in events:
-        event_key = (event.get("event_date"), event.get("venue_name"), event.get("client_name"))
-        if event_key not in seen:
-            seen.add(event_key)
-            # Parse event date and filter
-            try:
-                event_date = datetime.strptime(event.get("event_date", ""), "%Y-%m-%d")
-                if today.date() <= event_date.date() <= end_date.date():
-                    unique_events.append(event)
-            except ValueError:
-                pass
+    if not events:
+        return [], errors
+    
+    # Deduplicate and filter to date range in one vectorized pass
+    # (overlapping windows return the same event more than once)
+    end_date = today + timedelta(days=days_ahead)
+    events_df = pd.DataFrame(events).reindex(columns=["event_date", "venue_name", "client_name"])
+    event_dates = pd.to_datetime(events_df["event_date"], format="%Y-%m-%d", errors="coerce", cache=True)
+    in_range = event_dates.between(pd.Timestamp(today.date()), pd.Timestamp(end_date.date()))
     
-    # Sort by date
-    unique_events.sort(key=lambda x: x.get("event_date", ""))
-    return unique_events
+    # Sort by date, keeping the original event dicts
+    keep = event_dates[in_range & ~events_df.duplicated()].sort_values(kind="stable")
+    return [events[i] for i in keep.index], errors
 
 
 # =============================================================================
 # DATA PROCESSING
 # =============================================================================
 
+def parse_day_labels(days, year):
+    """Parse "Feb 3"-style Day labels (no leading zero) into datetimes in the given year."""
+    normalized = days.astype(str).str.split().str.join(" ")
+    return pd.to_datetime(normalized + f" {year}", format="%b %d %Y", errors="coerce")
+
+
 def calculate_booking_pace(df):
     """Calculate current booking pace vs last year."""
     today = datetime.now()
@@ -346,63 +539,49 @@ def calculate_booking_pace(df):
     if current_col is None:
         return None, None, None, f"Column '{current_year}' not found. Available: {list(df.columns)[:10]}"
     
-    # Find today's row by matching the Day column
-    # Sheet format: "mmm d" → "Feb 3" (no leading zero)
-    # Use %-d for no leading zero on Mac/Linux
-    try:
-        today_month_day = today.strftime("%b %-d")  # "Feb 3"
-    except ValueError:
-        # Windows doesn't support %-d, fall back to manual
-        today_month_day = today.strftime("%b %d").lstrip("0").replace(" 0", " ")
-    
     # Find the most recent row that has data for the current year
-    # (today's row might not be populated yet)
-    best_row = None
-    best_day = None
+    # (today's row might not be populated yet). Day labels use the sheet's
+    # "mmm d" format ("Feb 3") and were parsed when the sheet was loaded.
+    if "_day_parsed" in df.columns:
+        parsed_days = df["_day_parsed"]
+    else:
+        parsed_days = pd.Series(pd.NaT, index=df.index)
     
-    for idx, row in df.iterrows():
-        day_str = str(row.get("Day", "")).strip()
-        current_val = row.get(current_col, "")
-        
-        # Skip rows without current year data
-        # Empty cells may come back as "", None, or 0
-        if current_val == "" or current_val is None or current_val == 0:
-            continue
-            
-        try:
-            # Parse the day string
-            normalized = " ".join(day_str.split())
-            parsed = datetime.strptime(f"{normalized} {today.year}", "%b %d %Y")
-            
-            # Only consider days up to today
-            if parsed.date() <= today.date():
-                best_row = row
-                best_day = day_str
-        except ValueError:
-            continue
+    # Skip rows without current year data (empty cells were loaded as 0)
+    has_current = df[current_col] != 0
     
-    today_row = best_row
+    # Only consider days up to today
+    candidates = parsed_days[has_current & (parsed_days <= pd.Timestamp(today.date()))]
+    today_row = df.loc[candidates.idxmax()] if not candidates.empty else None
     
     if today_row is None:
         sample_days = df["Day"].head(5).tolist() if "Day" in df.columns else []
         return None, None, None, f"No matching day found. Sample: {sample_days}"
     
-    current_count = today_row.get(current_col, 0)
-    last_year_count = today_row.get(last_col, 0) if last_col else 0
-    
-    # Handle empty or non-numeric values
-    try:
-        current_count = int(current_count) if current_count else 0
-        last_year_count = int(last_year_count) if last_year_count else 0
-    except (ValueError, TypeError):
-        current_count = 0
-        last_year_count = 0
+    # Year columns are already ints (see get_year_comparison_data)
+    current_count = int(today_row[current_col])
+    last_year_count = int(today_row[last_col]) if last_col is not None else 0
     
     diff = current_count - last_year_count
     
     return current_count, last_year_count, diff, None
 
 
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def get_booking_pace(df):
+    """Cached booking pace for this Year Comparison frame, so fragment reruns skip the scan."""
+    return calculate_booking_pace(df)
+
+
+def pace_chart_points(rows, current_col, last_col):
+    """Day labels and current/last year counts for the given rows, in date order."""
+    rows = rows.sort_values("_day_parsed", kind="stable")
+    dates = rows["Day"].astype(str).str.strip().tolist()
+    current_values = rows[current_col].astype(int).tolist()
+    last_values = rows[last_col].astype(int).tolist() if last_col is not None else [0] * len(rows)
+    return dates, current_values, last_values
+
+
 def create_booking_pace_chart(df, days=30):
     """Create a line chart comparing booking pace YoY for the last N days."""
     today = datetime.now()
@@ -418,50 +597,21 @@ def create_booking_pace_chart(df, days=30):
         if str(col) == str(last_year):
             last_col = col
     
-    if current_col is None:
+    if current_col is None or "_day_parsed" not in df.columns:
         return None
     
-    # Build data for last N days
-    chart_data = []
+    # Only include last N days up to today, skipping rows without current
+    # year data (empty cells were loaded as 0)
+    days_ago = (pd.Timestamp(today.date()) - df["_day_parsed"]).dt.days
+    in_range = (df[current_col] != 0) & days_ago.between(0, days)
     
-    for idx, row in df.iterrows():
-        day_str = str(row.get("Day", "")).strip()
-        current_val = row.get(current_col, "")
-        last_val = row.get(last_col, "") if last_col else ""
-        
-        # Skip rows without current year data
-        if current_val == "" or current_val is None or current_val == 0:
-            continue
-        
-        try:
-            normalized = " ".join(day_str.split())
-            parsed = datetime.strptime(f"{normalized} {current_year}", "%b %d %Y")
-            
-            # Only include last N days up to today
-            days_ago = (today.date() - parsed.date()).days
-            if 0 <= days_ago <= days:
-                chart_data.append({
-                    "date": parsed,
-                    "day_str": day_str,
-                    str(current_year): int(current_val) if current_val else 0,
-                    str(last_year): int(last_val) if last_val else 0
-                })
-        except (ValueError, TypeError):
-            continue
-    
-    if not chart_data:
+    dates, current_values, last_values = pace_chart_points(df[in_range], current_col, last_col)
+    if not dates:
         return None
     
-    # Sort by date
-    chart_data.sort(key=lambda x: x["date"])
-    
     # Create Plotly figure
     fig = go.Figure()
     
-    dates = [d["day_str"] for d in chart_data]
-    current_values = [d[str(current_year)] for d in chart_data]
-    last_values = [d[str(last_year)] for d in chart_data]
-    
     # 2026 line (primary)
     fig.add_trace(go.Scatter(
         x=dates,
@@ -526,55 +676,25 @@ def create_booking_pace_chart_ytd(df):
         if str(col) == str(last_year):
             last_col = col
     
-    if current_col is None:
+    if current_col is None or "_day_parsed" not in df.columns:
         return None
     
-    # Build weekly data points from Jan 1 to today
-    chart_data = []
-    
-    for idx, row in df.iterrows():
-        day_str = str(row.get("Day", "")).strip()
-        current_val = row.get(current_col, "")
-        last_val = row.get(last_col, "") if last_col else ""
-        
-        # Skip rows without current year data
-        if current_val == "" or current_val is None or current_val == 0:
-            continue
-        
-        try:
-            normalized = " ".join(day_str.split())
-            parsed = datetime.strptime(f"{normalized} {current_year}", "%b %d %Y")
-            
-            # Only include dates from Jan 1 to today
-            if parsed.date() <= today.date():
-                # Check if this is approximately a Monday (or first/last of visible range)
-                is_monday = parsed.weekday() == 0
-                is_first = parsed.month == 1 and parsed.day <= 3
-                is_latest = (today.date() - parsed.date()).days <= 1
-                
-                if is_monday or is_first or is_latest:
-                    chart_data.append({
-                        "date": parsed,
-                        "day_str": day_str,
-                        str(current_year): int(current_val) if current_val else 0,
-                        str(last_year): int(last_val) if last_val else 0
-                    })
-        except (ValueError, TypeError):
-            continue
-    
-    if not chart_data:
+    # Weekly data points from Jan 1 to today: Mondays, plus the first days
+    # of January and the latest day so the line spans the whole range
+    parsed_days = df["_day_parsed"]
+    days_ago = (pd.Timestamp(today.date()) - parsed_days).dt.days
+    is_monday = parsed_days.dt.weekday == 0
+    is_first = (parsed_days.dt.month == 1) & (parsed_days.dt.day <= 3)
+    is_latest = days_ago <= 1
+    in_range = (df[current_col] != 0) & (days_ago >= 0) & (is_monday | is_first | is_latest)
+    
+    dates, current_values, last_values = pace_chart_points(df[in_range], current_col, last_col)
+    if not dates:
         return None
     
-    # Sort by date
-    chart_data.sort(key=lambda x: x["date"])
-    
     # Create Plotly figure
     fig = go.Figure()
     
-    dates = [d["day_str"] for d in chart_data]
-    current_values = [d[str(current_year)] for d in chart_data]
-    last_values = [d[str(last_year)] for d in chart_data]
-    
     # Current year line
     fig.add_trace(go.Scatter(
         x=dates,
@@ -623,27 +743,54 @@ def create_booking_pace_chart_ytd(df):
     return fig
 
 
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def get_booking_pace_charts(yoy_df):
+    """Cached (YTD, last 30 days) pace figures for this frame, so reruns skip rebuilding both."""
+    return create_booking_pace_chart_ytd(yoy_df), create_booking_pace_chart(yoy_df, days=30)
+
+
+def parse_sheet_dates(values):
+    """Parse a column of sheet dates ("4/26/26", "4/26/2026", "2026-04-26") to datetimes."""
+    # m/d/yy first, then an element-wise fallback for just the cells that missed;
+    # cache=True parses each distinct string once. Unparseable or blank cells become NaT
+    parsed = pd.to_datetime(values, format="%m/%d/%y", errors="coerce", cache=True)
+    missed = parsed.isna()
+    if missed.any():
+        parsed[missed] = pd.to_datetime(values[missed], format="mixed", errors="coerce", cache=True)
+    return parsed
+
+
+def summarize_conversion(counts):
+    """Convert a (group x Resolution) count table into per-group conversion stats."""
+    # Exclude Full and Turn-away from denominator (capacity constraints, not sales failures)
+    zeros = pd.Series(0, index=counts.index)
+    booked = counts.get("Booked", zeros)
+    adjusted_total = counts.sum(axis=1) - counts.get("Full", zeros) - counts.get("We turn down", zeros)
+    
+    has_total = adjusted_total > 0
+    booked = booked[has_total]
+    adjusted_total = adjusted_total[has_total]
+    rates = booked / adjusted_total * 100
+    
+    return {
+        group: {"total": int(total), "booked": int(n_booked), "conversion_rate": float(rate)}
+        for group, total, n_booked, rate in zip(rates.index, adjusted_total, booked, rates)
+    }
+
+
+def describe_missing_dates(rows, limit=10):
+    """Return 'Event Date - Venue' labels for the first few rows, shown in the debug panel."""
+    rows = rows.head(limit)
+    venues = rows.get("Venue (if known)", pd.Series("?", index=rows.index, dtype=object))
+    return (rows["Event Date"] + " - " + venues.str[:30]).tolist()
+
+
 def calculate_lead_metrics(df):
     """Calculate lead time and conversion metrics for 2026 events."""
-    # Filter for 2026 events (by Event Date, not Timestamp)
-    def is_2026_event(event_date_str):
-        if not event_date_str or str(event_date_str).strip() == "":
-            return False
-        try:
-            # Try various date formats
-            for fmt in ["%m/%d/%y", "%m/%d/%Y", "%Y-%m-%d"]:
-                try:
-                    dt = pd.to_datetime(event_date_str, format=fmt)
-                    return dt.year == 2026
-                except:
-                    continue
-            # Fallback to pandas auto-parse
-            dt = pd.to_datetime(event_date_str, errors="coerce")
-            return pd.notna(dt) and dt.year == 2026
-        except:
-            return False
-    
-    df_2026_events = df[df["Event Date"].apply(is_2026_event)].copy()
+    # Filter for 2026 events (by Event Date, not Timestamp); the parsed dates
+    # are reused for the lead time math below
+    event_dates = parse_sheet_dates(df["Event Date"])
+    df_2026_events = df[event_dates.dt.year == 2026].copy()
     
     if df_2026_events.empty:
         return {}
@@ -667,6 +814,11 @@ def calculate_lead_metrics(df):
         "booked_with_dates": len(df_with_dates[df_with_dates["Resolution"] == "Booked"]),
     }
     
+    # Dedup stats recorded by get_inquiry_tracker_data
+    if "dedup_pre" in df.attrs:
+        metrics["_debug"]["dedup_pre"] = df.attrs["dedup_pre"]
+        metrics["_debug"]["dedup_post"] = df.attrs["dedup_post"]
+    
     # Find booked events missing dates
     booked_2026 = df_2026_events[df_2026_events["Resolution"] == "Booked"]
     booked_missing_inquiry = booked_2026[booked_2026["Inquiry Date"].astype(str).str.strip() == ""]
@@ -677,16 +829,10 @@ def calculate_lead_metrics(df):
     
     if len(booked_missing_inquiry) > 0:
         # Get event dates and venues of missing
-        missing_info = []
-        for _, row in booked_missing_inquiry.iterrows():
-            missing_info.append(f"{row.get('Event Date', '?')} - {row.get('Venue (if known)', '?')[:30]}")
-        metrics["_debug"]["missing_inquiry_details"] = missing_info[:10]  # Limit to 10
+        metrics["_debug"]["missing_inquiry_details"] = describe_missing_dates(booked_missing_inquiry)
     
     if len(booked_missing_decision) > 0:
-        missing_info = []
-        for _, row in booked_missing_decision.iterrows():
-            missing_info.append(f"{row.get('Event Date', '?')} - {row.get('Venue (if known)', '?')[:30]}")
-        metrics["_debug"]["missing_decision_details"] = missing_info[:10]
+        metrics["_debug"]["missing_decision_details"] = describe_missing_dates(booked_missing_decision)
     
     # Total counts by resolution (only rows with both dates)
     resolution_counts = df_with_dates["Resolution"].value_counts().to_dict()
@@ -724,116 +870,59 @@ def calculate_lead_metrics(df):
     metrics["cold_never_acknowledged"] = cold_never_acknowledged
     
     # Lead time calculations (Event Date - Inquiry Date)
-    lead_times_by_resolution = {}
-    days_to_decision_by_resolution = {}
-    
-    for _, row in df_with_dates.iterrows():
-        resolution = row["Resolution"]
-        
-        # Calculate lead time (Event Date - Inquiry Date)
-        try:
-            event_date = pd.to_datetime(row["Event Date"], format="%m/%d/%y", errors="coerce")
-            if pd.isna(event_date):
-                event_date = pd.to_datetime(row["Event Date"], errors="coerce")
-            
-            inquiry_date = pd.to_datetime(row["Inquiry Date"], errors="coerce")
-            
-            if pd.notna(event_date) and pd.notna(inquiry_date):
-                lead_time_days = (event_date - inquiry_date).days
-                if lead_time_days >= 0:  # Sanity check
-                    if resolution not in lead_times_by_resolution:
-                        lead_times_by_resolution[resolution] = []
-                    lead_times_by_resolution[resolution].append(lead_time_days)
-        except Exception:
-            pass
-        
-        # Calculate days to decision (Decision Date - Inquiry Date)
-        try:
-            decision_date = pd.to_datetime(row["Decision Date"], errors="coerce")
-            inquiry_date = pd.to_datetime(row["Inquiry Date"], errors="coerce")
-            
-            if pd.notna(decision_date) and pd.notna(inquiry_date):
-                days_to_decision = (decision_date - inquiry_date).days
-                if days_to_decision >= 0:
-                    if resolution not in days_to_decision_by_resolution:
-                        days_to_decision_by_resolution[resolution] = []
-                    days_to_decision_by_resolution[resolution].append(days_to_decision)
-        except Exception:
-            pass
-    
-    # Calculate averages and medians
-    metrics["lead_times"] = {}
-    for resolution, times in lead_times_by_resolution.items():
-        if times:
-            avg_days = sum(times) / len(times)
-            sorted_times = sorted(times)
-            median_days = sorted_times[len(sorted_times) // 2]
-            metrics["lead_times"][resolution] = {
-                "avg_days": avg_days,
-                "avg_months": avg_days / 30.44,
-                "median_days": median_days,
-                "median_months": median_days / 30.44,
-                "count": len(times)
-            }
-    
-    metrics["days_to_decision"] = {}
-    for resolution, times in days_to_decision_by_resolution.items():
-        if times:
-            metrics["days_to_decision"][resolution] = {
-                "avg_days": sum(times) / len(times),
-                "median_days": sorted(times)[len(times) // 2],
-                "count": len(times)
-            }
+    # Parse each date column once; format="mixed" parses element-wise like a per-cell call
+    event_dates = event_dates.loc[df_with_dates.index]
+    inquiry_dates = pd.to_datetime(df_with_dates["Inquiry Date"], format="mixed", errors="coerce", cache=True)
+    decision_dates = pd.to_datetime(df_with_dates["Decision Date"], format="mixed", errors="coerce", cache=True)
+    
+    # Negative spans are data-entry errors; NaT rows drop out of the >= 0 check too
+    lead_time_days = (event_dates - inquiry_dates).dt.days
+    lead_time_days = lead_time_days[lead_time_days >= 0]
+    days_to_decision = (decision_dates - inquiry_dates).dt.days
+    days_to_decision = days_to_decision[days_to_decision >= 0]
+    
+    # Calculate averages and medians per resolution
+    stat_names = {"mean": "avg_days", "median": "median_days", "size": "count"}
+    lead_stats = lead_time_days.groupby(
+        df_with_dates.loc[lead_time_days.index, "Resolution"], observed=True
+    ).agg(["mean", "median", "size"]).rename(columns=stat_names)
+    lead_stats["avg_months"] = lead_stats["avg_days"] / 30.44
+    lead_stats["median_months"] = lead_stats["median_days"] / 30.44
+    metrics["lead_times"] = lead_stats.to_dict("index")
+    
+    decision_stats = days_to_decision.groupby(
+        df_with_dates.loc[days_to_decision.index, "Resolution"], observed=True
+    ).agg(["mean", "median", "size"]).rename(columns=stat_names)
+    metrics["days_to_decision"] = decision_stats.to_dict("index")
     
     # Conversion by source
-    # Exclude Full and Turn-away from denominator (capacity constraints, not sales failures)
-    source_counts = df_with_dates.groupby("Initial Contact")["Resolution"].value_counts().unstack(fill_value=0)
-    metrics["by_source"] = {}
-    for source in source_counts.index:
-        row = source_counts.loc[source]
-        booked = row.get("Booked", 0)
-        full = row.get("Full", 0)
-        turn_down = row.get("We turn down", 0)
-        
-        # Adjusted total excludes capacity constraints
-        adjusted_total = row.sum() - full - turn_down
-        
-        if adjusted_total > 0:
-            metrics["by_source"][source] = {
-                "total": int(adjusted_total),
-                "booked": int(booked),
-                "conversion_rate": booked / adjusted_total * 100
-            }
+    source_counts = pd.crosstab(df_with_dates["Initial Contact"], df_with_dates["Resolution"])
+    metrics["by_source"] = summarize_conversion(source_counts)
     
     # Level of interaction analysis
-    # Exclude Full and Turn-away from denominator (capacity constraints, not sales failures)
-    interaction_counts = df_with_dates.groupby("Level of interaction")["Resolution"].value_counts().unstack(fill_value=0)
-    metrics["by_interaction"] = {}
-    for interaction in interaction_counts.index:
-        row = interaction_counts.loc[interaction]
-        booked = row.get("Booked", 0)
-        full = row.get("Full", 0)
-        turn_down = row.get("We turn down", 0)
-        
-        # Adjusted total excludes capacity constraints
-        adjusted_total = row.sum() - full - turn_down
-        
-        if adjusted_total > 0:
-            metrics["by_interaction"][interaction] = {
-                "total": int(adjusted_total),
-                "booked": int(booked),
-                "conversion_rate": booked / adjusted_total * 100
-            }
+    interaction_counts = pd.crosstab(df_with_dates["Level of interaction"], df_with_dates["Resolution"])
+    metrics["by_interaction"] = summarize_conversion(interaction_counts)
     
     # AAG house DJ bookings (venue handoffs, not sales conversions)
     # These are: Allied Arts Guild venue, Booked, Never acknowledged
     venue_col = "Venue (if known)"
     if venue_col in df_2026_events.columns:
-        # Match variations: "Allied Arts Guild", "AAG", etc.
+        # Match variations: "Allied Arts Guild", "AAG", etc. with plain
+        # substring searches rather than a regex
+        venues = df_2026_events[venue_col]
+        is_aag = (
+            venues.str.contains("Allied Arts", case=False, na=False, regex=False) |
+            venues.str.contains("AAG", case=False, na=False, regex=False)
+        )
+        # Level of interaction is categorical: check each label once, not each row
+        interaction = df_2026_events["Level of interaction"]
+        never_labels = interaction.cat.categories[
+            interaction.cat.categories.str.contains("never", case=False, regex=False)
+        ]
         aag_bookings = df_2026_events[
-            (df_2026_events[venue_col].astype(str).str.contains("Allied Arts|AAG", case=False, na=False, regex=True)) &
+            is_aag &
             (df_2026_events["Resolution"] == "Booked") &
-            (df_2026_events["Level of interaction"].astype(str).str.lower().str.contains("never", na=False))
+            interaction.isin(never_labels)
         ]
         metrics["aag_house_bookings"] = len(aag_bookings)
     else:
@@ -842,68 +931,52 @@ def calculate_lead_metrics(df):
     return metrics
 
 
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def get_lead_metrics():
+    """Cached lead metrics, so reruns reuse a small dict instead of the inquiry DataFrame."""
+    return calculate_lead_metrics(get_inquiry_tracker_data(2026))
+
+
+# First name (lowercase) -> initials shown in the upcoming events list
+DJ_INITIALS = {
+    "henry": "HK",
+    "woody": "WM",
+    "paul": "PB",
+    "stefano": "SB",
+    "felipe": "FS",
+    "stephanie": "SD",
+}
+# One case-insensitive scan; each alternative is a group named by its initials
+DJ_INITIALS_RE = re.compile(
+    "|".join(f"(?P<{initials}>{re.escape(name)})" for name, initials in DJ_INITIALS.items()),
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=128)
 def get_dj_initials(dj_name):
     """Convert DJ full name to initials."""
     if not dj_name or dj_name == "Unassigned":
         return "TBA"
     
-    name_lower = dj_name.lower()
-    if "henry" in name_lower:
-        return "HK"
-    elif "woody" in name_lower:
-        return "WM"
-    elif "paul" in name_lower:
-        return "PB"
-    elif "stefano" in name_lower:
-        return "SB"
-    elif "felipe" in name_lower:
-        return "FS"
-    elif "stephanie" in name_lower:
-        return "SD"
-    return "??"
+    match = DJ_INITIALS_RE.search(dj_name)
+    return match.lastgroup if match else "??"
 
 
 # =============================================================================
 # DASHBOARD UI
 # =============================================================================
 
-def main():
-    st.set_page_config(
-        page_title="Big Fun DJ Operations",
-        page_icon="🎧",
-        layout="wide",
-    )
-    
-    st.title("🎧 Big Fun DJ Operations")
-    st.caption(f"Last refreshed: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
-    
-    # Add refresh button
-    if st.button("🔄 Refresh Data"):
-        st.cache_data.clear()
-        st.rerun()
-    
-    st.divider()
-    
-    # ==========================================================================
-    # ROW 1: Booking Pace + Inquiries Summary
-    # ==========================================================================
-    
-    # Pre-calculate metrics for use across sections
-    inquiry_df = None
-    metrics = {}
-    try:
-        inquiry_df = get_inquiry_tracker_data()
-        metrics = calculate_lead_metrics(inquiry_df)
-    except Exception as e:
-        st.warning(f"Could not load inquiry data: {str(e)[:100]}")
-    
-    # Load year comparison data for pace metrics and chart
-    yoy_df = None
-    try:
-        yoy_df = get_year_comparison_data()
-    except Exception as e:
-        pass  # Will show error in the booking pace section
-    
+# Interaction levels -> shorter column labels in the conversion row
+SHORT_LABELS = {
+    "Meaningful email interaction": "Email exchange",
+    "Had phone call/video chat": "Phone/video call",
+}
+
+
+@st.fragment
+def render_booking_summary(yoy_df, metrics):
+    """Booking pace metric next to the 2026 inquiry counts."""
     col1, col2 = st.columns(2)
     
     # Booking Pace
@@ -915,7 +988,7 @@ def main():
             elif yoy_df.empty:
                 st.warning("Year comparison data is empty")
             else:
-                current, last_year, diff, error = calculate_booking_pace(yoy_df)
+                current, last_year, diff, error = get_booking_pace(yoy_df)
                 
                 if error:
                     st.warning(error)
@@ -946,16 +1019,17 @@ def main():
                 st.metric("Full/Turn-away", metrics.get("full", 0) + metrics.get("we_turn_down", 0))
                 st.metric("Cold/Ghosted", metrics.get("cold", 0))
             
-            # Debug section
-            if metrics.get("_debug"):
-                with st.expander("🔍 Debug: Filtering details"):
+            # Debug section, only built when asked for (a collapsed expander
+            # would still send all of its contents to the browser)
+            if metrics.get("_debug") and st.checkbox("🔍 Show debug details", key="show_debug"):
+                with st.expander("🔍 Debug: Filtering details", expanded=True):
                     debug = metrics["_debug"]
                     
                     # Show dedup stats if available
-                    if inquiry_df is not None and "_dedup_pre" in inquiry_df.columns:
-                        pre = inquiry_df["_dedup_pre"].iloc[0] if len(inquiry_df) > 0 else "?"
-                        post = inquiry_df["_dedup_post"].iloc[0] if len(inquiry_df) > 0 else "?"
-                        removed = pre - post if isinstance(pre, int) and isinstance(post, int) else "?"
+                    if "dedup_pre" in debug:
+                        pre = debug["dedup_pre"]
+                        post = debug["dedup_post"]
+                        removed = pre - post
                         st.write(f"**Deduplication:** {pre} rows → {post} rows ({removed} duplicates removed)")
                         st.write("---")
                     
@@ -974,40 +1048,50 @@ def main():
                             st.text(f"  • {item}")
         else:
             st.info("No inquiry data available")
-    
-    st.divider()
-    
-    # ==========================================================================
-    # ROW 2: Conversion (all metrics)
-    # ==========================================================================
-    
+
+
+@st.fragment
+def render_conversion(metrics):
+    """Overall, by-source and by-interaction conversion rates."""
     st.subheader("🎯 Conversion")
     
     if metrics:
+        # Everything this row reads from metrics, looked up once
+        conversion = metrics.get("conversion_rate", 0)
+        conversion_simple = metrics.get("conversion_rate_simple", 0)
+        by_source = metrics.get("by_source") or {}
+        by_interaction = metrics.get("by_interaction") or {}
+        aag_count = metrics.get("aag_house_bookings", 0)
+        
         # Top row: Overall rate + by source
         conv_col1, conv_col2 = st.columns(2)
         
         with conv_col1:
-            conversion = metrics.get("conversion_rate", 0)
-            conversion_simple = metrics.get("conversion_rate_simple", 0)
-            
             st.metric("Overall Conversion Rate", f"{conversion:.0f}%")
             st.caption(f"Excludes: Full, Turn-away, Cold (no response)")
             st.caption(f"Simple (all inquiries): {conversion_simple:.0f}%")
         
         with conv_col2:
             st.markdown("**By Lead Source:**")
-            by_source = metrics.get("by_source", {})
-            for source, data in sorted(by_source.items(), key=lambda x: -x[1]["conversion_rate"]):
-                if data["total"] >= 3:  # Only show sources with meaningful volume
-                    st.text(f"{source[:20]}: {data['conversion_rate']:.0f}% ({data['booked']}/{data['total']})")
+            if by_source:
+                source_df = pd.DataFrame.from_dict(by_source, orient="index").rename_axis("Source").reset_index()
+                source_df = source_df[source_df["total"] >= 3]  # Only show sources with meaningful volume
+                source_df = source_df.sort_values("conversion_rate", ascending=False, kind="stable")
+                st.dataframe(
+                    source_df[["Source", "conversion_rate", "booked", "total"]],
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        "conversion_rate": st.column_config.NumberColumn("Conversion", format="%.0f%%"),
+                        "booked": "Booked",
+                        "total": "Total",
+                    },
+                )
         
         # Bottom row: By interaction level
         st.markdown("**By Interaction Level:**")
         
-        if metrics.get("by_interaction"):
-            by_interaction = metrics.get("by_interaction", {})
-            
+        if by_interaction:
             # Order by typical sales funnel (excluding "Never acknowledged" - those are AAG handoffs)
             interaction_order = [
                 "Only acknowledged",
@@ -1015,153 +1099,140 @@ def main():
                 "Had phone call/video chat"
             ]
             
-            # Find matching keys (case-insensitive partial match)
+            # Find matching keys (case-insensitive partial match), lower-casing each key once
+            lowered_keys = {actual_key.lower(): actual_key for actual_key in by_interaction}
             matched_interactions = []
             for target in interaction_order:
-                for actual_key in by_interaction.keys():
-                    if target.lower() in actual_key.lower() or actual_key.lower() in target.lower():
-                        matched_interactions.append((target, actual_key))
-                        break
+                target_lower = target.lower()
+                actual_key = next(
+                    (key for lowered, key in lowered_keys.items() if target_lower in lowered or lowered in target_lower),
+                    None,
+                )
+                if actual_key is not None:
+                    matched_interactions.append((target, actual_key))
             
             if matched_interactions:
-                # Add AAG column at the end
-                cols = st.columns(len(matched_interactions) + 1)
-                
-                for idx, (label, actual_key) in enumerate(matched_interactions):
+                # One table row: a rate column per interaction level, AAG count at the end
+                row = {}
+                column_config = {}
+                for label, actual_key in matched_interactions:
                     data = by_interaction[actual_key]
-                    with cols[idx]:
-                        short_label = label.replace("Meaningful email interaction", "Email exchange").replace("Had phone call/video chat", "Phone/video call")
-                        st.metric(
-                            label=short_label,
-                            value=f"{data['conversion_rate']:.0f}%",
-                            help=f"{data['booked']} booked / {data['total']} total"
-                        )
+                    short_label = SHORT_LABELS.get(label, label)
+                    row[short_label] = data["conversion_rate"]
+                    column_config[short_label] = st.column_config.NumberColumn(
+                        format="%.0f%%",
+                        help=f"{data['booked']} booked / {data['total']} total"
+                    )
                 
                 # AAG house DJ bookings (separate from sales funnel)
-                with cols[-1]:
-                    aag_count = metrics.get("aag_house_bookings", 0)
-                    st.metric(
-                        label="AAG (house DJ)",
-                        value=aag_count,
-                        help="Allied Arts Guild bookings via venue handoff"
-                    )
+                row["AAG (house DJ)"] = aag_count
+                column_config["AAG (house DJ)"] = st.column_config.NumberColumn(
+                    help="Allied Arts Guild bookings via venue handoff"
+                )
+                
+                st.dataframe(pd.DataFrame([row]), hide_index=True, use_container_width=True, column_config=column_config)
     else:
         st.info("No conversion data available")
-    
-    st.divider()
-    
-    # ==========================================================================
-    # ROW 3: Booking Pace Charts
-    # ==========================================================================
-    
-    # Booking Pace Charts
+
+
+@st.fragment
+def render_booking_pace_charts(yoy_df):
+    """YTD and last-30-days booking pace charts."""
     try:
         if yoy_df is not None and not yoy_df.empty:
+            ytd_chart, daily_chart = get_booking_pace_charts(yoy_df)
             chart_col1, chart_col2 = st.columns(2)
             
             with chart_col1:
                 st.caption("**Year to Date (weekly)**")
-                ytd_chart = create_booking_pace_chart_ytd(yoy_df)
                 if ytd_chart:
                     st.plotly_chart(ytd_chart, use_container_width=True)
             
             with chart_col2:
                 st.caption("**Last 30 Days (daily)**")
-                daily_chart = create_booking_pace_chart(yoy_df, days=30)
                 if daily_chart:
                     st.plotly_chart(daily_chart, use_container_width=True)
     except Exception as e:
         st.caption(f"Could not load pace charts: {str(e)[:50]}")
-    
-    st.divider()
-    
-    # ==========================================================================
-    # ROW 4: Upcoming Events
-    # ==========================================================================
-    
+
+
+@st.fragment
+def render_upcoming_events():
+    """Events in the next 14 days, grouped by date."""
     st.subheader("📅 Upcoming Events (Next 14 Days)")
     
     try:
-        events = get_upcoming_events(14)
+        events, errors = get_upcoming_events(14)
+        for error in errors:
+            st.warning(error)
         
         if events:
-            # Group by date
-            events_by_date = {}
-            for event in events:
-                date = event.get("event_date", "Unknown")
-                if date not in events_by_date:
-                    events_by_date[date] = []
-                events_by_date[date].append(event)
+            # One row per event; a missing DJ shows as TBA
+            events_df = pd.DataFrame(events).reindex(columns=["event_date", "venue_name", "assigned_dj"])
+            events_df = events_df.fillna({"event_date": "Unknown", "venue_name": "Unknown venue", "assigned_dj": ""})
+            
+            # Format dates in one vectorized pass: "Sat Feb 3" (unparseable dates shown as-is)
+            parsed_dates = pd.to_datetime(events_df["event_date"], format="%Y-%m-%d", errors="coerce", cache=True)
+            events_df["date_label"] = (
+                parsed_dates.dt.strftime("%a %b ") + parsed_dates.dt.day.astype("Int64").astype(str)
+            ).fillna(events_df["event_date"])
+            
+            # DJ initials and truncated venue names, also computed per column
+            venues = events_df["venue_name"].astype(str)
+            events_df["venue_label"] = venues.where(venues.str.len() <= 20, venues.str[:17] + "...")
+            events_df["initials"] = events_df["assigned_dj"].map(get_dj_initials)
+            
+            # Group by date (groupby sorts the dates)
+            events_by_date = events_df.groupby("event_date", sort=True)
             
             # Display in columns
-            cols = st.columns(min(len(events_by_date), 4))
+            cols = st.columns(min(events_by_date.ngroups, 4))
             
-            for idx, (date, day_events) in enumerate(sorted(events_by_date.items())):
+            for idx, (_, day_events) in enumerate(events_by_date):
                 col_idx = idx % 4
                 with cols[col_idx]:
-                    # Format date
-                    try:
-                        dt = datetime.strptime(date, "%Y-%m-%d")
-                        formatted_date = f"{dt.strftime('%a %b')} {dt.day}"  # "Sat Feb 3"
-                    except ValueError:
-                        formatted_date = date
+                    st.markdown(f"**{day_events['date_label'].iat[0]}**")
                     
-                    st.markdown(f"**{formatted_date}**")
-                    
-                    for event in day_events:
-                        dj = event.get("assigned_dj", "TBA")
-                        initials = get_dj_initials(dj)
-                        venue = event.get("venue_name", "Unknown venue")
-                        # Truncate venue name
-                        if len(venue) > 20:
-                            venue = venue[:17] + "..."
-                        
-                        st.text(f"[{initials}] {venue}")
+                    for event in day_events.itertuples(index=False):
+                        st.text(f"[{event.initials}] {event.venue_label}")
                     st.text("")  # Spacer
         else:
             st.info("No upcoming events found")
     except Exception as e:
         st.error(f"Could not load upcoming events: {e}")
-    
-    st.divider()
-    
-    # ==========================================================================
-    # ROW 5: DJ Bookings by Person
-    # ==========================================================================
-    
+
+
+@st.fragment
+def render_dj_bookings():
+    """Booked event counts per DJ from the Availability Matrix."""
     st.subheader("🎧 Events Booked by DJ (2026)")
     
     try:
         dj_counts = get_dj_booking_counts(2026)
         
         if dj_counts:
-            # Separate TBA from assigned DJs
-            tba_count = dj_counts.pop("TBA", 0)
+            # Separate TBA from assigned DJs (without mutating the returned dict)
+            tba_count = dj_counts.get("TBA", 0)
+            assigned = {dj: count for dj, count in dj_counts.items() if dj != "TBA"}
             
             # Sort assigned DJs by count descending
-            sorted_djs = sorted(dj_counts.items(), key=lambda x: -x[1])
+            sorted_djs = heapq.nlargest(len(assigned), assigned.items(), key=itemgetter(1))
             
-            # Create columns for each DJ
-            cols = st.columns(len(sorted_djs))
-            
-            for idx, (dj_name, count) in enumerate(sorted_djs):
-                with cols[idx]:
-                    st.metric(label=dj_name, value=count)
+            # One table row with a column per DJ, rather than a metric widget each
+            st.dataframe(pd.DataFrame([dict(sorted_djs)]), hide_index=True, use_container_width=True)
             
             # Show totals
-            assigned_total = sum(dj_counts.values())
+            assigned_total = sum(assigned.values())
             st.caption(f"Assigned: {assigned_total} • Unassigned (TBA): {tba_count} • Total: {assigned_total + tba_count}")
         else:
             st.info("No booking data available")
     except Exception as e:
         st.error(f"Could not load DJ bookings: {str(e)[:100]}")
-    
-    st.divider()
-    
-    # ==========================================================================
-    # ROW 6: Lead Time Analysis
-    # ==========================================================================
-    
+
+
+@st.fragment
+def render_lead_times(metrics):
+    """Lead time and days-to-decision tables by outcome."""
     st.subheader("⏱️ Lead Time Analysis (2026)")
     
     if metrics and metrics.get("lead_times"):
@@ -1171,47 +1242,153 @@ def main():
             st.markdown("**Lead Time by Outcome**")
             lead_times = metrics.get("lead_times", {})
             
-            # Create a simple table
-            lt_data = []
-            for resolution, data in lead_times.items():
-                lt_data.append({
-                    "Outcome": resolution,
-                    "Median": f"{data['median_months']:.1f} mo",
-                    "Avg": f"{data['avg_months']:.1f} mo",
-                    "Count": data["count"]
-                })
-            
-            if lt_data:
-                lt_df = pd.DataFrame(lt_data)
-                lt_df = lt_df.sort_values("Count", ascending=False)
-                st.dataframe(lt_df, hide_index=True, use_container_width=True)
+            if lead_times:
+                lt_df = pd.DataFrame.from_dict(lead_times, orient="index").rename_axis("Outcome").reset_index()
+                lt_df = lt_df.sort_values("count", ascending=False, kind="stable")
+                st.dataframe(
+                    lt_df[["Outcome", "median_months", "avg_months", "count"]],
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        "median_months": st.column_config.NumberColumn("Median", format="%.1f mo"),
+                        "avg_months": st.column_config.NumberColumn("Avg", format="%.1f mo"),
+                        "count": "Count",
+                    },
+                )
         
         with col2:
             st.markdown("**Days to Decision by Outcome**")
             days_to_dec = metrics.get("days_to_decision", {})
             
-            dtd_data = []
-            for resolution, data in days_to_dec.items():
-                dtd_data.append({
-                    "Outcome": resolution,
-                    "Avg Days": f"{data['avg_days']:.0f}",
-                    "Median Days": f"{data['median_days']:.0f}",
-                    "Count": data["count"]
-                })
-            
-            if dtd_data:
-                dtd_df = pd.DataFrame(dtd_data)
-                dtd_df = dtd_df.sort_values("Count", ascending=False)
-                st.dataframe(dtd_df, hide_index=True, use_container_width=True)
+            if days_to_dec:
+                dtd_df = pd.DataFrame.from_dict(days_to_dec, orient="index").rename_axis("Outcome").reset_index()
+                dtd_df = dtd_df.sort_values("count", ascending=False, kind="stable")
+                st.dataframe(
+                    dtd_df[["Outcome", "avg_days", "median_days", "count"]],
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        "avg_days": st.column_config.NumberColumn("Avg Days", format="%.0f"),
+                        "median_days": st.column_config.NumberColumn("Median Days", format="%.0f"),
+                        "count": "Count",
+                    },
+                )
     else:
         st.info("Lead time data requires both Inquiry Date and Decision Date fields")
+
+
+def main():
+    st.set_page_config(
+        page_title="Big Fun DJ Operations",
+        page_icon="🎧",
+        layout="wide",
+    )
+    
+    st.title("🎧 Big Fun DJ Operations")
+    
+    # Stamp the session's first load and each forced refresh, not every rerun
+    if "last_refresh" not in st.session_state:
+        st.session_state.last_refresh = datetime.now()
+    st.caption(f"Last refreshed: {st.session_state.last_refresh:%B %d, %Y at %I:%M %p}")
+    
+    # Add refresh button
+    if st.button("🔄 Refresh Data"):
+        st.cache_data.clear()
+        # The disk copies only track Drive's modifiedTime, which can lag edits
+        # (and ignores formula recalculation), so a forced refresh drops them too
+        clear_cached_values()
+        st.session_state.last_refresh = datetime.now()
+        st.rerun()
+    
+    st.divider()
+    
+    # ==========================================================================
+    # ROW 1: Booking Pace + Inquiries Summary
+    # ==========================================================================
+    
+    # Start the independent loads together so their network waits overlap.
+    # Workers get this run's script context so the cached loaders behave as
+    # they do on the main thread; the events and DJ rows read their (now warm)
+    # caches when they render. The loaders skip their own spinners (each
+    # worker would add one) in favour of this single one
+    ctx = get_script_run_ctx()
+    with st.spinner("Loading data…"):
+        with ThreadPoolExecutor(max_workers=4, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+            metrics_future = executor.submit(get_lead_metrics)
+            yoy_future = executor.submit(get_year_comparison_data)
+            prefetch_futures = [
+                executor.submit(get_upcoming_events, 14),
+                executor.submit(get_dj_booking_counts, 2026),
+            ]
+        # Their sections retry and show the error on the page; log it here too
+        for future in prefetch_futures:
+            try:
+                future.result()
+            except Exception:
+                logger.exception("Prefetching dashboard data failed")
+    
+    # Pre-calculate metrics for use across sections
+    metrics = {}
+    try:
+        metrics = metrics_future.result()
+    except Exception as e:
+        st.warning(f"Could not load inquiry data: {str(e)[:100]}")
+    
+    # Load year comparison data for pace metrics and chart
+    yoy_df = None
+    try:
+        yoy_df = yoy_future.result()
+    except Exception as e:
+        pass  # Will show error in the booking pace section
+    
+    render_booking_summary(yoy_df, metrics)
+    
+    st.divider()
+    
+    # ==========================================================================
+    # ROW 2: Conversion (all metrics)
+    # ==========================================================================
+    
+    render_conversion(metrics)
+    
+    st.divider()
+    
+    # ==========================================================================
+    # ROW 3: Booking Pace Charts
+    # ==========================================================================
+    
+    render_booking_pace_charts(yoy_df)
+    
+    st.divider()
+    
+    # ==========================================================================
+    # ROW 4: Upcoming Events
+    # ==========================================================================
+    
+    render_upcoming_events()
+    
+    st.divider()
+    
+    # ==========================================================================
+    # ROW 5: DJ Bookings by Person
+    # ==========================================================================
+    
+    render_dj_bookings()
+    
+    st.divider()
+    
+    # ==========================================================================
+    # ROW 6: Lead Time Analysis
+    # ==========================================================================
+    
+    render_lead_times(metrics)
     
     # ==========================================================================
     # Footer
     # ==========================================================================
     
     st.divider()
-    st.caption("Big Fun DJ Operations Dashboard • Data refreshes hourly • Click 🔄 to force refresh")
+    st.caption("Big Fun DJ Operations Dashboard • Sheets data refreshes every 5 minutes • Click 🔄 to force refresh")
 
 
 if __name__ == "__main__":